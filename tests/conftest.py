@@ -0,0 +1,72 @@
+"""
+Shared fixtures for the Mergington High School Activities API tests
+"""
+
+import json
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+import app as _app
+
+try:
+    import uvloop  # noqa: F401
+except ImportError:  # optional; anyio falls back to the default asyncio loop
+    _BACKEND_OPTIONS = {}
+else:
+    _BACKEND_OPTIONS = {"use_uvloop": True}
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib json decodes the same bodies
+    _loads = json.loads
+else:
+    _loads = orjson.loads
+
+
+@pytest.fixture(scope="session")
+def app_module():
+    """The app module, for calling endpoint functions directly"""
+    return _app
+
+
+@pytest.fixture(scope="session")
+def app():
+    """The FastAPI application under test"""
+    return _app.app
+
+
+@pytest.fixture(scope="session")
+def activities():
+    """The app's in-memory activity database"""
+    return _app.activities
+
+
+@pytest.fixture(scope="session")
+def json_body():
+    """Decode a response body as JSON, with orjson when installed"""
+    def decode(response):
+        return _loads(response.content)
+    return decode
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    """Create a single test client for the FastAPI app, shared by all tests"""
+    with TestClient(app, backend_options=_BACKEND_OPTIONS) as c:
+        yield c
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run async tests on asyncio (uvloop when installed), once per session"""
+    return "asyncio", _BACKEND_OPTIONS
+
+
+@pytest.fixture(scope="session")
+async def async_client(app, anyio_backend):
+    """Create an async client that calls the ASGI app in-process"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
@@ -2,115 +2,141 @@
 Tests for the Mergington High School Activities API
 """
 
+import asyncio
 import pytest
-import sys
-from pathlib import Path
+from urllib.parse import quote
 
-# Add src directory to path so we can import app
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+from fastapi import HTTPException
 
-from fastapi.testclient import TestClient
-from app import app
 
+# Canonical initial state, built once at import and restored before each test
+_ORIGINAL_ACTIVITIES = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+    },
+    "Basketball Team": {
+        "description": "Competitive basketball practice and games",
+        "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
+        "max_participants": 15,
+        "participants": ["alex@mergington.edu"]
+    },
+    "Tennis Club": {
+        "description": "Learn tennis skills and participate in tournaments",
+        "schedule": "Saturdays, 10:00 AM - 12:00 PM",
+        "max_participants": 10,
+        "participants": ["lucas@mergington.edu", "nina@mergington.edu"]
+    },
+    "Art Studio": {
+        "description": "Explore painting, drawing, and mixed media",
+        "schedule": "Tuesdays and Fridays, 4:00 PM - 5:30 PM",
+        "max_participants": 18,
+        "participants": ["isabella@mergington.edu"]
+    },
+    "Drama Club": {
+        "description": "Theater production and performance workshops",
+        "schedule": "Wednesdays and Thursdays, 3:30 PM - 5:00 PM",
+        "max_participants": 25,
+        "participants": ["james@mergington.edu", "grace@mergington.edu", "henry@mergington.edu"]
+    },
+    "Debate Team": {
+        "description": "Develop argumentation and public speaking skills",
+        "schedule": "Mondays and Thursdays, 3:30 PM - 4:45 PM",
+        "max_participants": 16,
+        "participants": ["noah@mergington.edu"]
+    },
+    "Science Club": {
+        "description": "Conduct experiments and explore scientific concepts",
+        "schedule": "Wednesdays, 3:45 PM - 5:15 PM",
+        "max_participants": 22,
+        "participants": ["ava@mergington.edu", "liam@mergington.edu", "mia@mergington.edu"]
+    }
+}
 
-@pytest.fixture
-def client():
-    """Create a test client for the FastAPI app"""
-    return TestClient(app)
+# Activity and participant counts at reset time, so tests need not fetch the pre-state
+_INITIAL_COUNTS = {name: len(v["participants"]) for name, v in _ORIGINAL_ACTIVITIES.items()}
+EXPECTED_COUNT = len(_ORIGINAL_ACTIVITIES)
+
+# Pre-encoded endpoint paths, including one for an activity that does not exist
+_ACTIVITY_NAMES = [*_ORIGINAL_ACTIVITIES, "Nonexistent Club"]
+SIGNUP_PATHS = {name: "/activities/" + quote(name) + "/signup" for name in _ACTIVITY_NAMES}
+UNREGISTER_PATHS = {name: "/activities/" + quote(name) + "/unregister" for name in _ACTIVITY_NAMES}
+
+
+@pytest.fixture(scope="session")
+def _frozen_activities():
+    """Shared snapshot of the initial activities that every reset copies from"""
+    return _ORIGINAL_ACTIVITIES
+
+
+def _restore(activities, snapshot):
+    """Clear and reset activities from the snapshot"""
+    # Other values are immutable str/int, so only the participants lists need copying
+    activities.clear()
+    activities.update({
+        name: {**activity, "participants": activity["participants"].copy()}
+        for name, activity in snapshot.items()
+    })
 
 
 @pytest.fixture
-def reset_activities():
+def reset_activities(activities, _frozen_activities):
     """Reset activities to initial state before each test"""
-    from app import activities
-    
-    # Store original state
-    original_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Competitive basketball practice and games",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["alex@mergington.edu"]
-        },
-        "Tennis Club": {
-            "description": "Learn tennis skills and participate in tournaments",
-            "schedule": "Saturdays, 10:00 AM - 12:00 PM",
-            "max_participants": 10,
-            "participants": ["lucas@mergington.edu", "nina@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore painting, drawing, and mixed media",
-            "schedule": "Tuesdays and Fridays, 4:00 PM - 5:30 PM",
-            "max_participants": 18,
-            "participants": ["isabella@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Theater production and performance workshops",
-            "schedule": "Wednesdays and Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 25,
-            "participants": ["james@mergington.edu", "grace@mergington.edu", "henry@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop argumentation and public speaking skills",
-            "schedule": "Mondays and Thursdays, 3:30 PM - 4:45 PM",
-            "max_participants": 16,
-            "participants": ["noah@mergington.edu"]
-        },
-        "Science Club": {
-            "description": "Conduct experiments and explore scientific concepts",
-            "schedule": "Wednesdays, 3:45 PM - 5:15 PM",
-            "max_participants": 22,
-            "participants": ["ava@mergington.edu", "liam@mergington.edu", "mia@mergington.edu"]
-        }
-    }
-    
-    # Clear and reset
-    activities.clear()
-    activities.update(original_activities)
-    
-    yield
-    
-    # Restore original state after test
-    activities.clear()
-    activities.update(original_activities)
+    # Each xdist worker imports app on its own, so this dict is worker-local
+    # No teardown needed: the next test resets before it runs
+    _restore(activities, _frozen_activities)
+
+
+# Decoded bodies of read-only calls, keyed by (method, path, sorted params)
+_CACHE = {}
+
+GET_ACTIVITIES = pytest.param(("GET", "/activities", {}), id="get-activities")
+
+
+@pytest.fixture
+def http_call(request, client, json_body, activities, _frozen_activities):
+    """Call a read-only endpoint once per unique request and reuse the decoded body"""
+    method, path, params = request.param
+    key = (method, path, tuple(sorted(params.items())))
+    if key not in _CACHE:
+        # Only a real call needs the initial state; cache hits skip the reset
+        _restore(activities, _frozen_activities)
+        response = client.request(method, path, params=params)
+        assert response.status_code == 200
+        _CACHE[key] = json_body(response)
+    return _CACHE[key]
 
 
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_all_activities(self, client, reset_activities):
+    @pytest.mark.parametrize("http_call", [GET_ACTIVITIES], indirect=True)
+    def test_get_all_activities(self, http_call):
         """Test retrieving all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        data = response.json()
+        data = http_call
         assert isinstance(data, dict)
-        assert len(data) == 9
+        assert len(data) == EXPECTED_COUNT
         assert "Chess Club" in data
         assert "Programming Class" in data
     
-    def test_activity_structure(self, client, reset_activities):
+    @pytest.mark.parametrize("http_call", [GET_ACTIVITIES], indirect=True)
+    def test_activity_structure(self, http_call):
         """Test that activities have the expected structure"""
-        response = client.get("/activities")
-        data = response.json()
-        activity = data["Chess Club"]
+        activity = http_call["Chess Club"]
         
         assert "description" in activity
         assert "schedule" in activity
@@ -118,61 +144,56 @@ class TestGetActivities:
         assert "participants" in activity
         assert isinstance(activity["participants"], list)
     
-    def test_participants_in_activity(self, client, reset_activities):
+    @pytest.mark.parametrize("http_call", [GET_ACTIVITIES], indirect=True)
+    def test_participants_in_activity(self, http_call):
         """Test that participants are returned correctly"""
-        response = client.get("/activities")
-        data = response.json()
-        chess_club = data["Chess Club"]
+        chess_club = http_call["Chess Club"]
+        participants = set(chess_club["participants"])
         
         assert len(chess_club["participants"]) == 2
-        assert "michael@mergington.edu" in chess_club["participants"]
-        assert "daniel@mergington.edu" in chess_club["participants"]
+        assert "michael@mergington.edu" in participants
+        assert "daniel@mergington.edu" in participants
 
 
 class TestSignup:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
     
-    def test_signup_new_participant(self, client, reset_activities):
-        """Test signing up a new participant for an activity"""
-        response = client.post(
-            "/activities/Chess Club/signup?email=newstudent@mergington.edu"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "Signed up newstudent@mergington.edu for Chess Club" in data["message"]
+    @pytest.mark.parametrize("activity,email,status,detail_sub", [
+        pytest.param("Chess Club", "newstudent@mergington.edu", 200,
+                     "Signed up newstudent@mergington.edu for Chess Club", id="new"),
+        pytest.param("Nonexistent Club", "student@mergington.edu", 404,
+                     "Activity not found", id="nonexistent-activity"),
+    ])
+    def test_signup(self, client, json_body, reset_activities, activities, activity, email, status, detail_sub):
+        """Test signup responses over HTTP for a new participant and an unknown activity"""
+        response = client.post(SIGNUP_PATHS[activity], params={"email": email})
+        assert response.status_code == status
+        data = json_body(response)
+        assert detail_sub in data["message" if status == 200 else "detail"]
         
-        # Verify participant was added
-        activities_response = client.get("/activities")
-        activities = activities_response.json()
-        assert "newstudent@mergington.edu" in activities["Chess Club"]["participants"]
+        # Verify participant was added, or no activity was created
+        if status == 200:
+            assert email in set(activities[activity]["participants"])
+        else:
+            assert activity not in activities
     
-    def test_signup_duplicate_participant(self, client, reset_activities):
-        """Test that duplicate signups are rejected"""
-        response = client.post(
-            "/activities/Chess Club/signup?email=michael@mergington.edu"
-        )
-        assert response.status_code == 400
-        data = response.json()
-        assert "already signed up" in data["detail"]
-    
-    def test_signup_nonexistent_activity(self, client, reset_activities):
-        """Test signing up for a non-existent activity"""
-        response = client.post(
-            "/activities/Nonexistent Club/signup?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "Activity not found" in data["detail"]
+    def test_signup_duplicate_rejected(self, app_module, reset_activities, activities):
+        """Test duplicate signups by calling the endpoint function directly"""
+        with pytest.raises(HTTPException) as exc_info:
+            app_module.signup_for_activity("Chess Club", "michael@mergington.edu")
+        assert exc_info.value.status_code == 400
+        assert "already signed up" in exc_info.value.detail
+        
+        # Verify a duplicate was not added
+        assert activities["Chess Club"]["participants"].count("michael@mergington.edu") == 1
     
-    def test_signup_updates_participant_count(self, client, reset_activities):
+    def test_signup_updates_participant_count(self, client, reset_activities, activities):
         """Test that participant count is updated after signup"""
-        activities_before = client.get("/activities").json()
-        initial_count = len(activities_before["Programming Class"]["participants"])
+        initial_count = _INITIAL_COUNTS["Programming Class"]
         
-        client.post("/activities/Programming Class/signup?email=new@mergington.edu")
+        client.post(SIGNUP_PATHS["Programming Class"], params={"email": "new@mergington.edu"})
         
-        activities_after = client.get("/activities").json()
-        final_count = len(activities_after["Programming Class"]["participants"])
+        final_count = len(activities["Programming Class"]["participants"])
         
         assert final_count == initial_count + 1
 
@@ -180,47 +201,39 @@ class TestSignup:
 class TestUnregister:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
     
-    def test_unregister_existing_participant(self, client, reset_activities):
-        """Test unregistering an existing participant"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=michael@mergington.edu"
-        )
-        assert response.status_code == 200
-        data = response.json()
-        assert "Unregistered michael@mergington.edu from Chess Club" in data["message"]
+    @pytest.mark.parametrize("activity,email,status,detail_sub", [
+        pytest.param("Chess Club", "michael@mergington.edu", 200,
+                     "Unregistered michael@mergington.edu from Chess Club", id="existing"),
+        pytest.param("Nonexistent Club", "michael@mergington.edu", 404,
+                     "Activity not found", id="nonexistent-activity"),
+    ])
+    def test_unregister(self, client, json_body, reset_activities, activities, activity, email, status, detail_sub):
+        """Test unregister responses over HTTP for a registered participant and an unknown activity"""
+        response = client.delete(UNREGISTER_PATHS[activity], params={"email": email})
+        assert response.status_code == status
+        data = json_body(response)
+        assert detail_sub in data["message" if status == 200 else "detail"]
         
-        # Verify participant was removed
-        activities_response = client.get("/activities")
-        activities = activities_response.json()
-        assert "michael@mergington.edu" not in activities["Chess Club"]["participants"]
+        # Verify participant was removed, or no activity was created
+        if status == 200:
+            assert email not in set(activities[activity]["participants"])
+        else:
+            assert activity not in activities
     
-    def test_unregister_nonexistent_participant(self, client, reset_activities):
-        """Test unregistering a participant who is not registered"""
-        response = client.delete(
-            "/activities/Chess Club/unregister?email=notregistered@mergington.edu"
-        )
-        assert response.status_code == 400
-        data = response.json()
-        assert "not signed up" in data["detail"]
+    def test_unregister_not_registered_rejected(self, app_module, reset_activities):
+        """Test unregistering a non-participant by calling the endpoint function directly"""
+        with pytest.raises(HTTPException) as exc_info:
+            app_module.unregister_from_activity("Chess Club", "notregistered@mergington.edu")
+        assert exc_info.value.status_code == 400
+        assert "not signed up" in exc_info.value.detail
     
-    def test_unregister_nonexistent_activity(self, client, reset_activities):
-        """Test unregistering from a non-existent activity"""
-        response = client.delete(
-            "/activities/Nonexistent Club/unregister?email=michael@mergington.edu"
-        )
-        assert response.status_code == 404
-        data = response.json()
-        assert "Activity not found" in data["detail"]
-    
-    def test_unregister_updates_participant_count(self, client, reset_activities):
+    def test_unregister_updates_participant_count(self, client, reset_activities, activities):
         """Test that participant count is updated after unregister"""
-        activities_before = client.get("/activities").json()
-        initial_count = len(activities_before["Drama Club"]["participants"])
+        initial_count = _INITIAL_COUNTS["Drama Club"]
         
-        client.delete("/activities/Drama Club/unregister?email=james@mergington.edu")
+        client.delete(UNREGISTER_PATHS["Drama Club"], params={"email": "james@mergington.edu"})
         
-        activities_after = client.get("/activities").json()
-        final_count = len(activities_after["Drama Club"]["participants"])
+        final_count = len(activities["Drama Club"]["participants"])
         
         assert final_count == initial_count - 1
 
@@ -228,27 +241,47 @@ class TestUnregister:
 class TestSignupAndUnregister:
     """Integration tests for signup and unregister"""
     
-    def test_signup_then_unregister(self, client, reset_activities):
+    def test_signup_then_unregister(self, client, reset_activities, activities):
         """Test signing up and then unregistering"""
         email = "testuser@mergington.edu"
         activity = "Tennis Club"
         
         # Sign up
         signup_response = client.post(
-            f"/activities/{activity}/signup?email={email}"
+            SIGNUP_PATHS[activity], params={"email": email}
         )
         assert signup_response.status_code == 200
         
         # Verify signed up
-        activities = client.get("/activities").json()
-        assert email in activities[activity]["participants"]
+        assert email in set(activities[activity]["participants"])
         
         # Unregister
         unregister_response = client.delete(
-            f"/activities/{activity}/unregister?email={email}"
+            UNREGISTER_PATHS[activity], params={"email": email}
         )
         assert unregister_response.status_code == 200
         
         # Verify unregistered
-        activities = client.get("/activities").json()
-        assert email not in activities[activity]["participants"]
+        assert email not in set(activities[activity]["participants"])
+    
+    @pytest.mark.anyio
+    async def test_concurrent_signups_then_unregisters(self, async_client, reset_activities, activities):
+        """Test independent signups and unregisters issued concurrently"""
+        email = "testuser@mergington.edu"
+        names = ["Tennis Club", "Art Studio", "Debate Team"]
+        
+        # Sign up for every activity at once
+        responses = await asyncio.gather(
+            *(async_client.post(SIGNUP_PATHS[name], params={"email": email}) for name in names)
+        )
+        assert [r.status_code for r in responses] == [200] * len(names)
+        for name in names:
+            assert email in set(activities[name]["participants"])
+        
+        # Unregister from every activity at once
+        responses = await asyncio.gather(
+            *(async_client.delete(UNREGISTER_PATHS[name], params={"email": email}) for name in names)
+        )
+        assert [r.status_code for r in responses] == [200] * len(names)
+        for name in names:
+            assert email not in set(activities[name]["participants"])